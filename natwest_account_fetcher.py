@@ -5,11 +5,52 @@ This script fetches user account details using NatWest's Open Banking API
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
+import hashlib
+import time
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode, quote_plus, urljoin, urlparse, parse_qs
 import sys
 import os
+import logging
+
+# orjson decodes API responses much faster; fall back to the stdlib
+try:
+    import orjson
+    json_dumps = orjson.dumps
+except ImportError:
+    orjson = None
+
+    def json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
+
+logger = logging.getLogger(__name__)
+
+
+def parse_json(response: requests.Response):
+    """Decode a JSON response body, raising requests' JSONDecodeError on failure"""
+    if orjson is None:
+        # requests decodes via response.text, so bodies that aren't valid
+        # UTF-8 still surface as its JSONDecodeError
+        return response.json()
+    try:
+        return orjson.loads(response.content)
+    except orjson.JSONDecodeError as e:
+        raise requests.exceptions.JSONDecodeError(e.msg, e.doc, e.pos, response=response)
+
+
+def get_data_list(payload: Dict, key: str) -> List[Dict]:
+    """Return payload['Data'][key], or an empty list if it is missing"""
+    try:
+        return payload['Data'][key]
+    except (KeyError, TypeError):
+        return []
+
 
 # Import configuration
 try:
@@ -30,6 +71,59 @@ except ImportError:
     print("You can copy 'config.example.py' and fill in your details.\n")
     sys.exit(1)
 
+# Upper bound on concurrent account detail requests
+MAX_FETCH_WORKERS = 16
+
+# Client credentials tokens are cached here between runs
+TOKEN_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'natwest')
+TOKEN_EXPIRY_BUFFER = 300  # seconds to shave off expires_in
+
+# Account access consent request body, serialised once at import
+CONSENT_BODY = json_dumps({
+    "Data": {
+        "Permissions": [
+            "ReadAccountsDetail",
+            "ReadBalances",
+            "ReadTransactionsCredits",
+            "ReadTransactionsDebits",
+            "ReadTransactionsDetail",
+            "ReadProducts",
+            "ReadBeneficiariesDetail",
+            "ReadDirectDebits",
+            "ReadOffers",
+            "ReadScheduledPaymentsDetail",
+            "ReadStandingOrdersDetail",
+            "ReadStatementsDetail"
+        ]
+    },
+    "Risk": {}
+})
+
+# OAuth token endpoint bodies are sent pre-encoded
+FORM_HEADERS = {'Content-Type': 'application/x-www-form-urlencoded'}
+
+# Divider between accounts in the details output
+SEPARATOR = '─' * 60
+
+# Redirect handling for the sandbox authorization flow
+REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+MAX_AUTH_REDIRECTS = 5
+
+
+class PostSafeRetry(Retry):
+    """
+    Retry policy that only retries POSTs on 429 Too Many Requests
+    A 429 means the server rejected the request without processing it. A
+    502/504 can arrive after the server has already acted, and replaying
+    the POST would reuse a single-use authorization code (invalid_grant)
+    or create a duplicate consent
+    """
+    
+    def is_retry(self, method, status_code, has_retry_after=False):
+        if method.upper() == 'POST':
+            return bool(self.total) and status_code == 429
+        return super().is_retry(method, status_code, has_retry_after)
+
 
 class NatWestAPIClient:
     """Client for NatWest Open Banking API"""
@@ -43,103 +137,205 @@ class NatWestAPIClient:
         self.auth_base_url = auth_base_url
         self.access_token = None
         self.consent_id = None
+        self.token_from_cache = False
+        
+        # Token request bodies only vary by the authorization code, so
+        # encode the fixed parts once
+        self._cc_body = urlencode({
+            'grant_type': 'client_credentials',
+            'client_id': client_id,
+            'client_secret': client_secret,
+            'scope': 'accounts'
+        }).encode()
+        self._ac_body_prefix = urlencode({
+            'client_id': client_id,
+            'client_secret': client_secret,
+            'redirect_uri': redirect_uri,
+            'grant_type': 'authorization_code'
+        }).encode() + b'&code='
         
+        # Shared session so every call reuses pooled keep-alive connections
+        self.session = requests.Session()
+        # Retry transient sandbox errors instead of failing the whole run.
+        # GETs retry on any of these statuses; POSTs are not idempotent here
+        # (single-use auth codes, consent creation) so PostSafeRetry only
+        # retries them on 429, and POSTs are left out of allowed_methods so
+        # read errors after the body was sent are not replayed either
+        retry = PostSafeRetry(
+            total=5,
+            backoff_factor=0.5,
+            status_forcelist=[429, 502, 503, 504],
+            respect_retry_after_header=True
+        )
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=MAX_FETCH_WORKERS + 4,
+            max_retries=retry
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+    
+    def close(self):
+        """Close the underlying HTTP session"""
+        self.session.close()
+        
+    def _token_cache_path(self) -> str:
+        """Cache file for this client's credentials token"""
+        key = hashlib.sha256((self.client_id + self.client_secret).encode()).hexdigest()[:16]
+        return os.path.join(TOKEN_CACHE_DIR, f"cc_token_{key}.json")
+    
+    def _load_cached_token(self) -> Optional[str]:
+        """Return a cached client credentials token if it has not expired"""
+        try:
+            with open(self._token_cache_path()) as f:
+                cached = json.load(f)
+            if cached['expires_at'] > time.time():
+                return cached['access_token']
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        return None
+    
+    def _clear_cached_token(self):
+        """Remove this client's cached credentials token, if any"""
+        try:
+            os.remove(self._token_cache_path())
+        except OSError:
+            pass
+    
+    def _save_cached_token(self, token_data: Dict):
+        """Persist a client credentials token (owner read/write only)"""
+        try:
+            expires_in = int(token_data['expires_in'])
+        except (KeyError, TypeError, ValueError):
+            return
+        cached = {
+            'access_token': token_data.get('access_token'),
+            'expires_at': time.time() + expires_in - TOKEN_EXPIRY_BUFFER
+        }
+        path = self._token_cache_path()
+        try:
+            os.makedirs(TOKEN_CACHE_DIR, exist_ok=True)
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w') as f:
+                json.dump(cached, f)
+            os.chmod(path, 0o600)
+        except OSError as e:
+            logger.warning("  Could not cache token: %s", e)
+    
     def get_client_credentials_token(self) -> bool:
         """Get access token using client credentials flow"""
-        print("\n" + "="*60)
-        print("STEP 1: Getting Client Credentials Token")
-        print("="*60)
+        logger.info("\n" + "="*60)
+        logger.info("STEP 1: Getting Client Credentials Token")
+        logger.info("="*60)
+        
+        cached_token = self._load_cached_token()
+        if cached_token:
+            self.access_token = cached_token
+            self.token_from_cache = True
+            logger.info("✓ Using cached token")
+            return True
         
         url = f"{self.base_url}/token"
-        headers = {
-            'Content-Type': 'application/x-www-form-urlencoded'
-        }
-        data = {
-            'grant_type': 'client_credentials',
-            'client_id': self.client_id,
-            'client_secret': self.client_secret,
-            'scope': 'accounts'
-        }
         
         try:
-            response = requests.post(url, headers=headers, data=data)
+            response = self.session.post(url, headers=FORM_HEADERS, data=self._cc_body)
             response.raise_for_status()
             
-            token_data = response.json()
+            token_data = parse_json(response)
             self.access_token = token_data.get('access_token')
+            self.token_from_cache = False
+            self._save_cached_token(token_data)
             
-            print(f"✓ Token obtained successfully")
-            print(f"  Token Type: {token_data.get('token_type')}")
-            print(f"  Expires In: {token_data.get('expires_in')} seconds")
-            print(f"  Scope: {token_data.get('scope')}")
+            logger.info("✓ Token obtained successfully")
+            logger.info("  Token Type: %s", token_data.get('token_type'))
+            logger.info("  Expires In: %s seconds", token_data.get('expires_in'))
+            logger.info("  Scope: %s", token_data.get('scope'))
             
             return True
             
         except requests.exceptions.RequestException as e:
-            print(f"✗ Error getting token: {e}")
+            logger.error("✗ Error getting token: %s", e)
             if hasattr(e.response, 'text'):
-                print(f"  Response: {e.response.text}")
+                logger.error("  Response: %s", e.response.text)
             return False
     
     def create_account_consent(self) -> Optional[str]:
         """Create account access consent"""
-        print("\n" + "="*60)
-        print("STEP 2: Creating Account Access Consent")
-        print("="*60)
+        logger.info("\n" + "="*60)
+        logger.info("STEP 2: Creating Account Access Consent")
+        logger.info("="*60)
         
         url = f"{self.base_url}/open-banking/v4.0/aisp/account-access-consents"
         headers = {
             'Authorization': f'Bearer {self.access_token}',
             'Content-Type': 'application/json'
         }
-        data = {
-            "Data": {
-                "Permissions": [
-                    "ReadAccountsDetail",
-                    "ReadBalances",
-                    "ReadTransactionsCredits",
-                    "ReadTransactionsDebits",
-                    "ReadTransactionsDetail",
-                    "ReadProducts",
-                    "ReadBeneficiariesDetail",
-                    "ReadDirectDebits",
-                    "ReadOffers",
-                    "ReadScheduledPaymentsDetail",
-                    "ReadStandingOrdersDetail",
-                    "ReadStatementsDetail"
-                ]
-            },
-            "Risk": {}
-        }
         
         try:
-            response = requests.post(url, headers=headers, json=data)
+            response = self.session.post(url, headers=headers, data=CONSENT_BODY)
             response.raise_for_status()
             
-            consent_data = response.json()
-            self.consent_id = consent_data.get('Data', {}).get('ConsentId')
+            consent_data = parse_json(response)
+            consent = consent_data.get('Data') or {}
+            self.consent_id = consent.get('ConsentId')
             
-            print(f"✓ Consent created successfully")
-            print(f"  Consent ID: {self.consent_id}")
-            print(f"  Status: {consent_data.get('Data', {}).get('Status')}")
-            print(f"  Created: {consent_data.get('Data', {}).get('CreationDateTime')}")
+            logger.info("✓ Consent created successfully")
+            logger.info("  Consent ID: %s", self.consent_id)
+            logger.info("  Status: %s", consent.get('Status'))
+            logger.info("  Created: %s", consent.get('CreationDateTime'))
             
             return self.consent_id
             
         except requests.exceptions.RequestException as e:
-            print(f"✗ Error creating consent: {e}")
+            # A cached token may have been revoked or invalidated by a sandbox
+            # reset; drop it and retry once with a freshly issued token
+            if (self.token_from_cache and e.response is not None
+                    and e.response.status_code == 401):
+                logger.warning("  Cached token rejected, requesting a new one")
+                self._clear_cached_token()
+                if self.get_client_credentials_token():
+                    return self.create_account_consent()
+                return None
+            
+            logger.error("✗ Error creating consent: %s", e)
             if hasattr(e.response, 'text'):
-                print(f"  Response: {e.response.text}")
+                logger.error("  Response: %s", e.response.text)
             return None
     
+    @staticmethod
+    def _redirect_param(location: str, name: str) -> Optional[str]:
+        """Return a parameter from a redirect URL's query or fragment"""
+        parsed = urlparse(location)
+        for part in (parsed.query, parsed.fragment):
+            values = parse_qs(part).get(name)
+            if values:
+                return values[0]
+        return None
+    
+    @classmethod
+    def _extract_code(cls, location: str) -> Optional[str]:
+        """Extract the authorization code from a redirect URL"""
+        return cls._redirect_param(location, 'code')
+    
+    @classmethod
+    def _log_redirect_error(cls, location: str):
+        """Log the OAuth error carried by a redirect without an authorization code"""
+        logger.error("✗ No authorization code in redirect URI")
+        error = cls._redirect_param(location, 'error')
+        if error:
+            logger.error("  Error: %s", error)
+            logger.error("  Description: %s", cls._redirect_param(location, 'error_description'))
+        else:
+            logger.error("  Redirect URI: %s", location)
+    
     def authorize_consent(self, username: str = "123456789012") -> Optional[str]:
         """
         Authorize consent (Auto-approval for sandbox)
         Returns authorization code
         """
-        print("\n" + "="*60)
-        print("STEP 3: Authorizing Consent (Sandbox Auto-Approval)")
-        print("="*60)
+        logger.info("\n" + "="*60)
+        logger.info("STEP 3: Authorizing Consent (Sandbox Auto-Approval)")
+        logger.info("="*60)
         
         # Build authorization URL with auto-approval parameters
         auth_params = {
@@ -158,257 +354,322 @@ class NatWestAPIClient:
         url = f"{self.auth_base_url}/authorize"
         
         try:
-            # Make first request with allow_redirects=False to capture the redirect
-            print("  Making initial authorization request...")
-            response = requests.get(url, params=auth_params, allow_redirects=False)
+            # Ask for JSON up front: in AUTO_POSTMAN mode the sandbox can then
+            # return the final redirectUri directly, skipping the intermediate
+            # 302. Otherwise walk the redirect chain on the shared session
+            # (keep-alive), one hop at a time so we stop as soon as a Location
+            # carries the code rather than following it on to our own redirect URI
+            logger.info("  Making initial authorization request...")
+            response = self.session.get(url, params=auth_params, allow_redirects=False,
+                                        headers={'Accept': 'application/json'})
             
-            # Check if we got a redirect
-            if response.status_code in [302, 303, 307, 308]:
+            for _ in range(MAX_AUTH_REDIRECTS):
+                if response.status_code not in REDIRECT_STATUSES:
+                    break
+                
                 location = response.headers.get('Location', '')
-                print(f"  Got redirect to: {location[:80]}...")
+                if not location:
+                    # urljoin would resolve this back to the /authorize request
+                    logger.error("✗ Redirect without a Location header")
+                    return None
+                logger.info("  Got redirect to: %s...", location[:80])
                 
-                # Check if there's a code in the first redirect
-                if 'code=' in location:
-                    auth_code = location.split('code=')[1].split('&')[0]
-                    print(f"✓ Authorization successful")
-                    print(f"  Authorization Code: {auth_code[:20]}...")
+                auth_code = self._extract_code(location)
+                if auth_code:
+                    logger.info("✓ Authorization successful")
+                    logger.info("  Authorization Code: %s...", auth_code[:20])
                     return auth_code
                 
+                # Our own redirect URI without a code means authorization
+                # failed; it is not ours to fetch
+                if location.startswith(self.redirect_uri):
+                    self._log_redirect_error(location)
+                    return None
+                
                 # If no code yet, follow the redirect (it's another authorization endpoint)
-                print("  Following redirect to complete authorization...")
+                logger.info("  Following redirect to complete authorization...")
+                response = self.session.get(urljoin(response.url, location), allow_redirects=False)
+            
+            # AUTO_POSTMAN mode returns the redirect URI as JSON
+            if response.status_code == 200:
+                try:
+                    json_response = parse_json(response)
+                except json.JSONDecodeError:
+                    logger.error("✗ Response is not JSON")
+                    logger.error("  Response preview: %s...", response.text[:300])
+                    return None
                 
-                # Make GET request to the authorization endpoint
-                response2 = requests.get(location)
+                if 'redirectUri' not in json_response:
+                    logger.error("✗ No redirectUri in JSON response")
+                    logger.error("  Response: %s", json_response)
+                    return None
                 
-                # Check if response is JSON (AUTO_POSTMAN mode returns JSON)
-                if response2.status_code == 200:
-                    try:
-                        # Try to parse as JSON
-                        json_response = response2.json()
-                        
-                        if 'redirectUri' in json_response:
-                            redirect_uri = json_response['redirectUri']
-                            print(f"  Got redirect URI from JSON response")
-                            
-                            # Extract authorization code from redirect URI
-                            if 'code=' in redirect_uri:
-                                auth_code = redirect_uri.split('code=')[1].split('&')[0]
-                                print(f"✓ Authorization successful")
-                                print(f"  Authorization Code: {auth_code[:20]}...")
-                                return auth_code
-                            else:
-                                print(f"✗ No authorization code in redirect URI")
-                                print(f"  Redirect URI: {redirect_uri}")
-                                return None
-                        else:
-                            print(f"✗ No redirectUri in JSON response")
-                            print(f"  Response: {json_response}")
-                            return None
-                    except json.JSONDecodeError:
-                        print(f"✗ Response is not JSON")
-                        print(f"  Response preview: {response2.text[:300]}...")
-                        return None
+                redirect_uri = json_response['redirectUri']
+                logger.info("  Got redirect URI from JSON response")
                 
-                # Handle redirect responses (AUTO mode)
-                elif response2.status_code in [302, 303, 307, 308]:
-                    location2 = response2.headers.get('Location', '')
-                    print(f"  Got redirect to: {location2[:80]}...")
-                    
-                    if 'code=' in location2:
-                        auth_code = location2.split('code=')[1].split('&')[0]
-                        print(f"✓ Authorization successful")
-                        print(f"  Authorization Code: {auth_code[:20]}...")
-                        return auth_code
-                    else:
-                        print(f"✗ No authorization code in redirect")
-                        return None
-                else:
-                    print(f"✗ Unexpected response status: {response2.status_code}")
-                    print(f"  Response preview: {response2.text[:300]}...")
-                    return None
-            else:
-                print(f"✗ Unexpected response status: {response.status_code}")
-                print(f"  Response text: {response.text[:200]}")
+                auth_code = self._extract_code(redirect_uri)
+                if auth_code:
+                    logger.info("✓ Authorization successful")
+                    logger.info("  Authorization Code: %s...", auth_code[:20])
+                    return auth_code
+                
+                self._log_redirect_error(redirect_uri)
                 return None
+            
+            if response.status_code in REDIRECT_STATUSES:
+                logger.error("✗ No authorization code in redirect")
+            else:
+                logger.error("✗ Unexpected response status: %s", response.status_code)
+                logger.error("  Response preview: %s...", response.text[:300])
+            return None
                 
         except requests.exceptions.RequestException as e:
-            print(f"✗ Error during authorization: {e}")
+            logger.error("✗ Error during authorization: %s", e)
             return None
     
     def exchange_authorization_code(self, auth_code: str) -> bool:
         """Exchange authorization code for access token"""
-        print("\n" + "="*60)
-        print("STEP 4: Exchanging Authorization Code for Access Token")
-        print("="*60)
+        logger.info("\n" + "="*60)
+        logger.info("STEP 4: Exchanging Authorization Code for Access Token")
+        logger.info("="*60)
         
         url = f"{self.base_url}/token"
-        headers = {
-            'Content-Type': 'application/x-www-form-urlencoded'
-        }
-        data = {
-            'client_id': self.client_id,
-            'client_secret': self.client_secret,
-            'redirect_uri': self.redirect_uri,
-            'grant_type': 'authorization_code',
-            'code': auth_code
-        }
+        data = self._ac_body_prefix + quote_plus(auth_code).encode()
         
         try:
-            response = requests.post(url, headers=headers, data=data)
+            response = self.session.post(url, headers=FORM_HEADERS, data=data)
             response.raise_for_status()
             
-            token_data = response.json()
+            token_data = parse_json(response)
             self.access_token = token_data.get('access_token')
+            # All account calls from here on use this token, so set it once
+            self.session.headers['Authorization'] = f'Bearer {self.access_token}'
             
-            print(f"✓ Access token obtained")
-            print(f"  Token Type: {token_data.get('token_type')}")
-            print(f"  Expires In: {token_data.get('expires_in')} seconds")
-            print(f"  Scope: {token_data.get('scope')}")
+            logger.info("✓ Access token obtained")
+            logger.info("  Token Type: %s", token_data.get('token_type'))
+            logger.info("  Expires In: %s seconds", token_data.get('expires_in'))
+            logger.info("  Scope: %s", token_data.get('scope'))
             
             return True
             
         except requests.exceptions.RequestException as e:
-            print(f"✗ Error exchanging code: {e}")
+            logger.error("✗ Error exchanging code: %s", e)
             if hasattr(e.response, 'text'):
-                print(f"  Response: {e.response.text}")
+                logger.error("  Response: %s", e.response.text)
             return False
     
     def get_accounts(self) -> Optional[List[Dict]]:
         """Fetch all accounts"""
-        print("\n" + "="*60)
-        print("STEP 5: Fetching Account Details")
-        print("="*60)
+        logger.info("\n" + "="*60)
+        logger.info("STEP 5: Fetching Account Details")
+        logger.info("="*60)
         
         url = f"{self.base_url}/open-banking/v4.0/aisp/accounts"
-        headers = {
-            'Authorization': f'Bearer {self.access_token}'
-        }
-        
         try:
-            response = requests.get(url, headers=headers)
+            response = self.session.get(url)
             response.raise_for_status()
             
-            accounts_data = response.json()
-            accounts = accounts_data.get('Data', {}).get('Account', [])
+            accounts_data = parse_json(response)
+            accounts = get_data_list(accounts_data, 'Account')
             
-            print(f"✓ Retrieved {len(accounts)} account(s)")
+            logger.info("✓ Retrieved %s account(s)", len(accounts))
             
             return accounts
             
         except requests.exceptions.RequestException as e:
-            print(f"✗ Error fetching accounts: {e}")
+            logger.error("✗ Error fetching accounts: %s", e)
             if hasattr(e.response, 'text'):
-                print(f"  Response: {e.response.text}")
+                logger.error("  Response: %s", e.response.text)
             return None
     
     def get_account_balances(self, account_id: str) -> Optional[List[Dict]]:
         """Fetch account balances"""
         url = f"{self.base_url}/open-banking/v4.0/aisp/accounts/{account_id}/balances"
-        headers = {
-            'Authorization': f'Bearer {self.access_token}'
-        }
-        
         try:
-            response = requests.get(url, headers=headers)
+            response = self.session.get(url)
             response.raise_for_status()
             
-            balance_data = response.json()
-            balances = balance_data.get('Data', {}).get('Balance', [])
+            balance_data = parse_json(response)
+            balances = get_data_list(balance_data, 'Balance')
             
             return balances
             
         except requests.exceptions.RequestException as e:
-            print(f"✗ Error fetching balances: {e}")
+            logger.error("✗ Error fetching balances: %s", e)
             return None
     
     def get_account_transactions(self, account_id: str, limit: int = 10) -> Optional[List[Dict]]:
         """Fetch account transactions"""
         url = f"{self.base_url}/open-banking/v4.0/aisp/accounts/{account_id}/transactions"
-        headers = {
-            'Authorization': f'Bearer {self.access_token}'
-        }
-        
         try:
-            response = requests.get(url, headers=headers)
+            response = self.session.get(url)
             response.raise_for_status()
             
-            transaction_data = response.json()
-            transactions = transaction_data.get('Data', {}).get('Transaction', [])
+            transaction_data = parse_json(response)
+            transactions = get_data_list(transaction_data, 'Transaction')
             
             # Return only the requested number of transactions
             return transactions[:limit]
             
         except requests.exceptions.RequestException as e:
-            print(f"✗ Error fetching transactions: {e}")
+            logger.error("✗ Error fetching transactions: %s", e)
             return None
     
+    def get_all_balances(self) -> Optional[List[Dict]]:
+        """Fetch balances for all accounts using the bulk endpoint"""
+        url = f"{self.base_url}/open-banking/v4.0/aisp/balances"
+        try:
+            response = self.session.get(url)
+            response.raise_for_status()
+            
+            balance_data = parse_json(response)
+            return get_data_list(balance_data, 'Balance')
+            
+        except requests.exceptions.RequestException as e:
+            logger.warning("  Bulk balances unavailable (%s), fetching per account", e)
+            return None
+    
+    def get_all_transactions(self) -> Optional[List[Dict]]:
+        """Fetch transactions for all accounts using the bulk endpoint"""
+        url = f"{self.base_url}/open-banking/v4.0/aisp/transactions"
+        try:
+            response = self.session.get(url)
+            response.raise_for_status()
+            
+            transaction_data = parse_json(response)
+            return get_data_list(transaction_data, 'Transaction')
+            
+        except requests.exceptions.RequestException as e:
+            logger.warning("  Bulk transactions unavailable (%s), fetching per account", e)
+            return None
+    
+    def fetch_account_details(self, account_ids: List[str],
+                              limit: int = 5) -> Tuple[Dict[str, List[Dict]], Dict[str, List[Dict]]]:
+        """
+        Fetch balances and recent transactions for the given accounts
+        Returns (balances, transactions) dicts keyed by account ID
+        """
+        # Try the bulk endpoints first: two requests for all accounts
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            balances_future = executor.submit(self.get_all_balances)
+            transactions_future = executor.submit(self.get_all_transactions)
+        all_balances = balances_future.result()
+        all_transactions = transactions_future.result()
+        
+        balances_by_acc = defaultdict(list)
+        for balance in all_balances or []:
+            balances_by_acc[balance.get('AccountId')].append(balance)
+        
+        txns_by_acc = defaultdict(list)
+        for txn in all_transactions or []:
+            txns_by_acc[txn.get('AccountId')].append(txn)
+        for account_id in txns_by_acc:
+            txns_by_acc[account_id] = txns_by_acc[account_id][:limit]
+        
+        # Fall back to per-account requests for any account the bulk results
+        # don't cover: the bulk call failed, or the account's data is on a
+        # later page of the (paginated) bulk response
+        # (calls are I/O-bound; the worker count stays within pool_maxsize)
+        fetches = [
+            (balances_by_acc, account_id, self.get_account_balances, ())
+            for account_id in account_ids if account_id not in balances_by_acc
+        ] + [
+            (txns_by_acc, account_id, self.get_account_transactions, (limit,))
+            for account_id in account_ids if account_id not in txns_by_acc
+        ]
+        if not fetches:
+            return balances_by_acc, txns_by_acc
+        
+        with ThreadPoolExecutor(max_workers=min(MAX_FETCH_WORKERS, len(fetches))) as executor:
+            futures = [
+                (target, account_id, executor.submit(fetch, account_id, *args))
+                for target, account_id, fetch, args in fetches
+            ]
+        for target, account_id, future in futures:
+            target[account_id] = future.result() or []
+        
+        return balances_by_acc, txns_by_acc
+    
     def display_account_details(self, accounts: List[Dict]):
         """Display formatted account details"""
         print("\n" + "="*60)
         print("ACCOUNT DETAILS")
         print("="*60)
         
+        account_ids = [account.get('AccountId') for account in accounts]
+        balances_by_acc, txns_by_acc = self.fetch_account_details(account_ids, limit=5)
+        
+        # Build each account's block and write it in one go rather than
+        # issuing a separate print() per line
         for idx, account in enumerate(accounts, 1):
-            print(f"\n{'─'*60}")
-            print(f"ACCOUNT #{idx}")
-            print(f"{'─'*60}")
+            lines = [f"\n{SEPARATOR}", f"ACCOUNT #{idx}", SEPARATOR]
             
             # Basic account info
-            print(f"\n📋 Account Information:")
-            print(f"  Account ID: {account.get('AccountId')}")
-            print(f"  Account Type: {account.get('AccountType')}")
-            print(f"  Account Sub Type: {account.get('AccountSubType')}")
-            print(f"  Currency: {account.get('Currency')}")
-            print(f"  Nickname: {account.get('Nickname', 'N/A')}")
-            print(f"  Status: {account.get('Status', 'N/A')}")
+            lines.append(f"\n📋 Account Information:")
+            lines.append(f"  Account ID: {account.get('AccountId')}")
+            lines.append(f"  Account Type: {account.get('AccountType')}")
+            lines.append(f"  Account Sub Type: {account.get('AccountSubType')}")
+            lines.append(f"  Currency: {account.get('Currency')}")
+            lines.append(f"  Nickname: {account.get('Nickname', 'N/A')}")
+            lines.append(f"  Status: {account.get('Status', 'N/A')}")
             
             # Account details
             if 'Account' in account:
                 acc_details = account['Account'][0] if isinstance(account['Account'], list) else account['Account']
-                print(f"\n  Account Number:")
-                print(f"    Scheme: {acc_details.get('SchemeName')}")
-                print(f"    Identification: {acc_details.get('Identification')}")
-                print(f"    Name: {acc_details.get('Name', 'N/A')}")
+                lines.append(f"\n  Account Number:")
+                lines.append(f"    Scheme: {acc_details.get('SchemeName')}")
+                lines.append(f"    Identification: {acc_details.get('Identification')}")
+                lines.append(f"    Name: {acc_details.get('Name', 'N/A')}")
             
-            # Fetch and display balances
+            # Display balances
             account_id = account.get('AccountId')
-            balances = self.get_account_balances(account_id)
-            
+            balances = balances_by_acc[account_id]
             if balances:
-                print(f"\n💰 Balances:")
+                lines.append(f"\n💰 Balances:")
                 for balance in balances:
                     bal_type = balance.get('Type')
                     amount = balance.get('Amount', {})
                     indicator = balance.get('CreditDebitIndicator')
                     
-                    print(f"  {bal_type}:")
-                    print(f"    Amount: {amount.get('Currency')} {amount.get('Amount')}")
-                    print(f"    Type: {indicator}")
-                    print(f"    Date: {balance.get('DateTime', 'N/A')}")
-            
-            # Fetch and display recent transactions
-            transactions = self.get_account_transactions(account_id, limit=5)
+                    lines.append(f"  {bal_type}:")
+                    lines.append(f"    Amount: {amount.get('Currency')} {amount.get('Amount')}")
+                    lines.append(f"    Type: {indicator}")
+                    lines.append(f"    Date: {balance.get('DateTime', 'N/A')}")
             
+            # Display recent transactions
+            transactions = txns_by_acc[account_id]
             if transactions:
-                print(f"\n📊 Recent Transactions (Last 5):")
+                lines.append(f"\n📊 Recent Transactions (Last 5):")
                 for txn_idx, txn in enumerate(transactions, 1):
                     amount = txn.get('Amount', {})
                     indicator = txn.get('CreditDebitIndicator')
                     sign = '+' if indicator == 'Credit' else '-'
                     
-                    print(f"\n  Transaction {txn_idx}:")
-                    print(f"    Date: {txn.get('BookingDateTime', 'N/A')}")
-                    print(f"    Amount: {sign}{amount.get('Currency')} {amount.get('Amount')}")
-                    print(f"    Type: {indicator}")
-                    print(f"    Description: {txn.get('TransactionInformation', 'N/A')}")
-                    print(f"    Reference: {txn.get('TransactionReference', 'N/A')}")
-            
-            print()
+                    lines.append(f"\n  Transaction {txn_idx}:")
+                    lines.append(f"    Date: {txn.get('BookingDateTime', 'N/A')}")
+                    lines.append(f"    Amount: {sign}{amount.get('Currency')} {amount.get('Amount')}")
+                    lines.append(f"    Type: {indicator}")
+                    lines.append(f"    Description: {txn.get('TransactionInformation', 'N/A')}")
+                    lines.append(f"    Reference: {txn.get('TransactionReference', 'N/A')}")
+            
+            lines.append("")
+            sys.stdout.write("\n".join(lines) + "\n")
 
 
 def main():
     """Main function to run the account details fetcher"""
     
+    # Set LOGLEVEL=WARNING to silence the per-step progress output
+    level_name = (os.environ.get('LOGLEVEL') or 'INFO').upper()
+    level = logging.getLevelName(level_name)
+    logging.basicConfig(
+        level=level if isinstance(level, int) else logging.INFO,
+        format='%(message)s',
+        stream=sys.stdout
+    )
+    if not isinstance(level, int):
+        logger.warning("Unknown LOGLEVEL %r, using INFO", level_name)
+    
     print("\n" + "="*60)
     print("NatWest Open Banking - Account Details Fetcher")
     print("="*60)
@@ -456,6 +717,7 @@ def main():
     
     # Display formatted account details
     client.display_account_details(accounts)
+    client.close()
     
     print("\n" + "="*60)
     print("✓ Account details fetched successfully!")